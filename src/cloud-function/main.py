@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from contextlib import contextmanager
 from dataclasses import dataclass
 import os
@@ -6,13 +7,18 @@ import logging
 import json
 import sys
 
-from typing import Any, Dict, Tuple, Set
+from typing import Any, Dict, Iterator, Tuple, Set
 
 from google.api_core.exceptions import InvalidArgument, Forbidden, NotFound
 from google.cloud.aiplatform.pipeline_jobs import PipelineJob
 from google.cloud import storage
 from yaml.parser import ParserError
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module if orjson is unavailable.
+    orjson = None
+
 # Parse env variables on start-up to make sure they exist.
 GCP_PROJECT_ID = os.environ["GCP_PROJECT_ID"]
 GCP_REGION = os.environ["GCP_REGION"]
@@ -29,6 +35,20 @@ DATASET = os.environ["DATASET"]
 ARTIFACT_PATH = os.environ["ARTIFACT_PATH"]
 RUN_PATH = os.environ["RUN_PATH"]
 
+# Project-specific parameters from the Cloud Function environment.
+_ENV_PARAMETERS = {
+    "project_id": GCP_PROJECT_ID,
+    "region": GCP_REGION,
+    "zone": GCP_ZONE,
+    "artifact_bucket": ARTIFACT_BUCKET,
+    "artifact_path": ARTIFACT_PATH,
+    "input_bucket": INPUT_BUCKET,
+    "output_bucket": OUTPUT_BUCKET,
+}
+
+# Escapes line breaks in error details returned to the caller.
+_LOG_ESCAPE = str.maketrans({"\n": "\\n", "\r": "\\r"})
+
 
 class Response:
     """Generic interface for SuccessResponse/ErrorResponse (see below)."""
@@ -70,28 +90,41 @@ class ErrorResponse(Response):
         return payload, self.status_code
 
 
-def get_pipeline_parameters(pipeline_path: str) -> Set[str]:
-    """Returns parameter names from the given pipeline spec."""
-    with open(pipeline_path, encoding="utf-8") as file_:
-        pipeline_spec = json.load(file_)
-
+def get_pipeline_parameters(pipeline_spec: bytes) -> Set[str]:
+    """Returns parameter names from the given (raw) pipeline spec."""
+    parsed_spec = _json_loads(pipeline_spec)
     return set(
-        pipeline_spec["pipelineSpec"]["root"]["inputDefinitions"]["parameters"].keys()
+        parsed_spec["pipelineSpec"]["root"]["inputDefinitions"]["parameters"].keys()
     )
 
 
+def _json_loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _json_dumps(obj: Any) -> str:
+    return orjson.dumps(obj).decode() if orjson else json.dumps(obj)
+
+
 class CloudLoggingFormatter(logging.Formatter):
     """Produces messages compatible with google cloud logging"""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Payload is reused between records, which is safe as handlers
+        # format records one at a time while holding their lock.
+        self._payload = {
+            "message": None,
+            "severity": None,
+            "timestamp": {"seconds": 0, "nanos": 0},
+        }
+
     def format(self, record: logging.LogRecord) -> str:
-        message = super().format(record)
-        return json.dumps(
-            {
-                "message": message,
-                "severity": record.levelname,
-                "timestamp": {"seconds": int(record.created), "nanos": 0},
-            }
-        )
+        payload = self._payload
+        payload["message"] = super().format(record)
+        payload["severity"] = record.levelname
+        payload["timestamp"]["seconds"] = int(record.created)
+        return _json_dumps(payload)
 
 
 def setup_logging():
@@ -104,18 +137,47 @@ def setup_logging():
     root.setLevel(logging.DEBUG)
 
 
+# Pipeline specs and their parameter names by blob name, reused across warm
+# invocations. Entries are tied to the blob generation, as pushing a pipeline
+# overwrites the spec at the same path. The cache is kept small (LRU) as specs
+# can be large and function instances are memory-limited.
+_PIPELINE_CACHE_SIZE = 8
+_PIPELINE_CACHE: "OrderedDict[str, Tuple[int, bytes, Set[str]]]" = OrderedDict()
+
+
 @contextmanager
-def get_pipeline(model_name: str, model_version: str, pipeline_name: str) -> str:
-    """Fetches a pipeline definition and exposes it locally from a temporary file."""
+def get_pipeline(
+    model_name: str, model_version: str, pipeline_name: str
+) -> Iterator[Tuple[Set[str], str]]:
+    """
+    Fetches a pipeline definition, returning its parameter names together with
+    a temporary local copy of the spec (for PipelineJob).
+    """
 
-    pipeline_url = f"gs://{ARTIFACT_BUCKET}/models/{model_name}/{model_version}/{pipeline_name}.json"
+    pipeline_blob = f"models/{model_name}/{model_version}/{pipeline_name}.json"
 
     client = storage.Client()
-
-    with tempfile.NamedTemporaryFile() as pipeline_file:
-        client.download_blob_to_file(pipeline_url, file_obj=pipeline_file)
+    blob = client.bucket(ARTIFACT_BUCKET).blob(pipeline_blob)
+    blob.reload()  # Fetches the blob metadata, including its current generation.
+
+    cached = _PIPELINE_CACHE.get(pipeline_blob)
+    if cached is None or cached[0] != blob.generation:
+        pipeline_spec = blob.download_as_bytes(if_generation_match=blob.generation)
+        cached = (
+            blob.generation,
+            pipeline_spec,
+            get_pipeline_parameters(pipeline_spec),
+        )
+        _PIPELINE_CACHE[pipeline_blob] = cached
+        if len(_PIPELINE_CACHE) > _PIPELINE_CACHE_SIZE:
+            _PIPELINE_CACHE.popitem(last=False)  # Evict the least recently used spec.
+    _PIPELINE_CACHE.move_to_end(pipeline_blob)
+    _, pipeline_spec, pipeline_parameters = cached
+
+    with tempfile.NamedTemporaryFile(suffix=".json") as pipeline_file:
+        pipeline_file.write(pipeline_spec)
         pipeline_file.flush()  # ensure content is written to file
-        yield pipeline_file.name
+        yield pipeline_parameters, pipeline_file.name
 
 
 def process_request(request) -> Tuple[Dict[str, Any], int]:
@@ -142,36 +204,35 @@ def process_request(request) -> Tuple[Dict[str, Any], int]:
             status_code=400,
         )
 
+    if not response and not isinstance(pipeline_parameters, dict):
+        response = ErrorResponse(
+            type="invalid_pipeline_parameters",
+            title="Invalid parameters were passed to the pipeline",
+            detail="Expected 'pipeline_parameters' to be a JSON object",
+            status_code=400,
+        )
+
     if not response:  # Functional style Success/Failure objects would be nicer here.
         try:
-            with get_pipeline(model_name, model_version, pipeline_name) as pipeline_path:
-                # Project-specific parameters from the Cloud Function environment.
-                env_parameters = {
-                    k: v
-                    for k, v in {
-                        "project_id": GCP_PROJECT_ID,
-                        "region": GCP_REGION,
-                        "zone": GCP_ZONE,
-                        "artifact_bucket": ARTIFACT_BUCKET,
-                        "artifact_path": ARTIFACT_PATH,
-                        "input_bucket": INPUT_BUCKET,
-                        "output_bucket": OUTPUT_BUCKET,
-                    }.items()
-                    # Filter project-parameters against the pipeline parameter list
-                    # to avoid passing parameters that the pipeline doesn't accept.
-                    if k in get_pipeline_parameters(pipeline_path)
-                }
+            with get_pipeline(model_name, model_version, pipeline_name) as (
+                allowed_parameters,
+                pipeline_path,
+            ):
+                # Pass along any parameters we get to the function, but override
+                # any duplicates with our environment config. Environment parameters
+                # are filtered against the pipeline parameter list to avoid passing
+                # parameters that the pipeline doesn't accept.
+                parameter_values = pipeline_parameters.copy()
+                parameter_values.update(
+                    (k, _ENV_PARAMETERS[k])
+                    for k in _ENV_PARAMETERS.keys() & allowed_parameters
+                )
 
                 job = PipelineJob(
                     display_name=PIPELINE_NAME,
                     enable_caching=False,
                     template_path=pipeline_path,
-                    parameter_values={
-                        # Pass along any parameters we get to the function.
-                        **pipeline_parameters,
-                        # But override any duplicates with our environment config.
-                        **env_parameters,
-                    },
+                    parameter_values=parameter_values,
                     pipeline_root=f"gs://{ARTIFACT_BUCKET}/{RUN_PATH}",
                     location=GCP_REGION,
                 )
@@ -229,9 +290,7 @@ def process_request(request) -> Tuple[Dict[str, Any], int]:
             response = ErrorResponse(
                 type="unexpected_error",
                 title="An unexpected error occurred",
-                detail=getattr(exc, "message", str(exc))
-                .replace("\n", "\\n")
-                .replace("\r", "\\r")[:989],
+                detail=getattr(exc, "message", str(exc)).translate(_LOG_ESCAPE)[:989],
                 status_code=500,
             )
 
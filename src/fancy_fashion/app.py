@@ -1,14 +1,17 @@
+import asyncio
 import io
 import os
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 from urllib.parse import urlparse
 from google.cloud import storage
 
 import joblib
+import orjson
 import structlog
-from structlog.processors import JSONRenderer
 
 from fastapi import FastAPI, UploadFile
 from fastapi.responses import JSONResponse, PlainTextResponse
@@ -17,15 +20,45 @@ from fancy_fashion.model import generate_prediction, LABEL_MAPPING
 
 load_dotenv()
 
+# Labels indexed by predicted category, for direct lookup.
+_LABELS = tuple(LABEL_MAPPING[i] for i in range(len(LABEL_MAPPING)))
+
 def _structured_log_formatter(logger, log_method, event_dict):
     event_dict['severity'] = log_method.upper()
     event_dict['message'] = event_dict.pop('event')
     return event_dict
 
-structlog.configure_once(processors=[_structured_log_formatter, structlog.processors.JSONRenderer(sort_keys=True)])
+def _orjson_renderer(logger, log_method, event_dict):
+    # Falls back to repr() for unsupported types, like structlog's JSONRenderer.
+    return orjson.dumps(
+        event_dict,
+        default=repr,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    ).decode()
+
+structlog.configure_once(processors=[_structured_log_formatter, _orjson_renderer])
 logger = structlog.get_logger()
 
 
+# Models larger than this are downloaded using concurrent ranged requests.
+_CONCURRENT_DOWNLOAD_THRESHOLD = 32 * 1024 * 1024
+_DOWNLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+_DOWNLOAD_MAX_WORKERS = 8
+
+
+def _download_chunks_concurrently(blob: storage.Blob, file_obj) -> None:
+    """Downloads the blob into the given file in chunks, using parallel ranged requests."""
+
+    def _download_chunk(start: int) -> None:
+        end = min(start + _DOWNLOAD_CHUNK_SIZE, blob.size) - 1
+        chunk = blob.download_as_bytes(start=start, end=end, checksum=None)
+        os.pwrite(file_obj.fileno(), chunk, start)
+
+    with ThreadPoolExecutor(max_workers=_DOWNLOAD_MAX_WORKERS) as executor:
+        # Consume the results to propagate any exceptions raised by the workers.
+        list(executor.map(_download_chunk, range(0, blob.size, _DOWNLOAD_CHUNK_SIZE)))
+
+
 def _fetch_model(model_uri: str):
     storage_client = storage.Client()
 
@@ -35,9 +68,19 @@ def _fetch_model(model_uri: str):
 
     bucket = storage_client.bucket(bucket_name)
     blob = bucket.blob(blob_name)
-
-    with io.BytesIO(blob.download_as_bytes()) as model_file:
-        model = joblib.load(model_file)
+    blob.reload()  # Fetches the blob metadata, including its size.
+
+    if blob.size > _CONCURRENT_DOWNLOAD_THRESHOLD:
+        # Note: on Cloud Run /tmp is backed by memory, so peak memory here is still
+        # the artifact plus the loaded model. This path trades memory for a faster
+        # download; the streaming path below avoids holding the full artifact.
+        with tempfile.NamedTemporaryFile() as model_file:
+            _download_chunks_concurrently(blob, model_file)
+            model = joblib.load(model_file.name)
+    else:
+        # Stream the blob straight into joblib to avoid holding an extra copy in memory.
+        with blob.open("rb", chunk_size=_DOWNLOAD_CHUNK_SIZE) as model_file:
+            model = joblib.load(model_file)
 
     return model
 
@@ -56,18 +99,20 @@ def ping():
 
 
 @app.post("/predict", response_class=JSONResponse)
-def predict(image_data: UploadFile):
+async def predict(image_data: UploadFile):
     """Predict endpoint, which produces prediction for an uploaded image."""
 
-    raw_image_data = image_data.file.read()
+    raw_image_data = await image_data.read()
     image = io.BytesIO(raw_image_data)
 
-    confidence = generate_prediction(model, image)[0]
+    # Run the (CPU-bound) prediction in the default executor to keep the event loop free.
+    loop = asyncio.get_running_loop()
+    confidence = (await loop.run_in_executor(None, generate_prediction, model, image))[0]
 
-    predicted_category = confidence.argmax(axis=0)
-    prediction_confidence = confidence.max(axis=0)
+    predicted_category = int(confidence.argmax())
+    prediction_confidence = float(confidence[predicted_category])
 
-    predicted_label = LABEL_MAPPING[predicted_category]
+    predicted_label = _LABELS[predicted_category]
 
     logger.info(
         f"Generated prediction for {image_data.filename}",
@@ -1,6 +1,12 @@
+import asyncio
+import functools
+from typing import List
 
 import vertexai
-from vertexai.generative_models import GenerativeModel
+from vertexai.generative_models import GenerationConfig, GenerativeModel
+
+# Shared between calls, so the config isn't rebuilt for every prompt.
+_GENERATION_CONFIG = GenerationConfig(temperature=0)
 
 
 def initialise_llm(gcp_project: str, vertexai_llm_location: str) -> GenerativeModel:
@@ -9,11 +15,28 @@ def initialise_llm(gcp_project: str, vertexai_llm_location: str) -> GenerativeMo
     return llm_model
 
 
+@functools.lru_cache(maxsize=None)
+def get_llm(gcp_project: str, vertexai_llm_location: str) -> GenerativeModel:
+    """Returns a shared LLM model for the given project/location, initialising it on first use."""
+    return initialise_llm(gcp_project, vertexai_llm_location)
+
+
 def generate_llm_response(prompt: str, llm_model: GenerativeModel) -> str:
     model_response = llm_model.generate_content(
         prompt,
-        generation_config={"temperature": 0},
+        generation_config=_GENERATION_CONFIG,
     )
     text = model_response.text
-    
+
     return text
+
+
+async def generate_llm_responses(prompts: List[str], llm_model: GenerativeModel) -> List[str]:
+    """Generates responses for a batch of prompts concurrently."""
+    model_responses = await asyncio.gather(
+        *(
+            llm_model.generate_content_async(prompt, generation_config=_GENERATION_CONFIG)
+            for prompt in prompts
+        )
+    )
+    return [model_response.text for model_response in model_responses]
@@ -44,7 +44,8 @@ def train(train_data_path: str, model: Output[Model]) -> None:
 
     model_dir = Path(model.path)
     model_dir.mkdir(parents=True, exist_ok=True)
-    joblib.dump(trained_model, model_dir / "model.pkl")
+    # Pickle with protocol 5, the latest protocol on all supported Python versions.
+    joblib.dump(trained_model, model_dir / "model.pkl", protocol=5)
 
     
 @component(
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterable, Optional
 
 from google.cloud import aiplatform_v1
@@ -5,20 +6,32 @@ from google.cloud import aiplatform_v1
 from . import expr
 from .model import Artifact, Pipeline, PipelineRun
 
+# Maximum page size accepted by the metadata API for list requests.
+_PAGE_SIZE = 1000
+
 
 class VertexMlMetadataClient:
     """A more intuitive client for the Vertex ML Metadata Store."""
 
-    def __init__(self, project_id: str, region: str, metadata_store: str = "default"):
+    def __init__(
+        self,
+        project_id: str,
+        region: str,
+        metadata_store: str = "default",
+        client: Optional[aiplatform_v1.MetadataServiceClient] = None,
+    ):
         self._project_id = project_id
         self._region = region
         self._metadata_store = metadata_store
+        self._client = client
 
     def get_client(self) -> aiplatform_v1.MetadataServiceClient:
         """Gets the underlying Google Metadata service client for performing 'raw' queries."""
-        return aiplatform_v1.MetadataServiceClient(
-            client_options={"api_endpoint": f"{self._region}-aiplatform.googleapis.com"}
-        )
+        if self._client is None:
+            self._client = aiplatform_v1.MetadataServiceClient(
+                client_options={"api_endpoint": f"{self._region}-aiplatform.googleapis.com"}
+            )
+        return self._client
 
     def list_pipelines(self) -> Iterable[Pipeline]:
         """Lists pipelines in the given project and region."""
@@ -46,8 +59,20 @@ class VertexMlMetadataClient:
             filter=str(filter_expr)  # Coerce to string in case we're given something else
             if filter_expr
             else None,
+            page_size=_PAGE_SIZE,
         )
-        yield from map(Artifact.from_record, self.get_client().list_artifacts(request))
+        pages = self.get_client().list_artifacts(request).pages
+
+        page = next(pages, None)
+        if page is not None and page.next_page_token:
+            # Fetch the next page in the background while the current one is consumed.
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                while page is not None:
+                    next_page = executor.submit(next, pages, None)
+                    yield from Artifact.from_records(page.artifacts)
+                    page = next_page.result()
+        elif page is not None:
+            yield from Artifact.from_records(page.artifacts)
 
     def list_artifacts_for_pipeline(
         self, pipeline_name: str, schema_title: Optional[str] = None
@@ -1,6 +1,24 @@
+from typing import Optional
+
+# pylint: disable=too-few-public-methods
+
+
 class Expr:
     """Base class representing an expression in Googles ML metadata filter language."""
 
+    # Expressions are immutable, so the rendered string is cached on first use.
+    # This only pays off for callers that render the same expression repeatedly.
+    _rendered: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self._rendered is None:
+            self._rendered = self._render()
+        return self._rendered
+
+    def _render(self) -> str:
+        """Renders the expression as a filter string."""
+        raise NotImplementedError()
+
     def __and__(self, other: "Expr") -> "Expr":
         return And(self, other)
 
@@ -18,7 +36,7 @@ class Equals(Expr):
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}('{self._attr}', '{self._value}')"
 
-    def __str__(self) -> str:
+    def _render(self) -> str:
         return f'{self._attr}="{self._value}"'
 
 
@@ -31,7 +49,7 @@ class InContext(Expr):
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}('{self._context}')"
 
-    def __str__(self) -> str:
+    def _render(self) -> str:
         return f'in_context("{self._context}")'
 
 
@@ -44,7 +62,7 @@ class HasParentContext(Expr):
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}('{self._context}')"
 
-    def __str__(self) -> str:
+    def _render(self) -> str:
         return f'parent_contexts: "{self._context}"'
 
 
@@ -54,7 +72,7 @@ class And(Expr):
     def __init__(self, *exprs: Expr):
         self._exprs = exprs
 
-    def __str__(self) -> str:
+    def _render(self) -> str:
         return f"({' AND '.join(str(expr) for expr in self._exprs)})"
 
     def __repr__(self) -> str:
@@ -67,7 +85,7 @@ class Or(Expr):
     def __init__(self, *exprs: Expr):
         self._exprs = exprs
 
-    def __str__(self) -> str:
+    def _render(self) -> str:
         return f"({' OR '.join(str(expr) for expr in self._exprs)})"
 
     def __repr__(self) -> str:
@@ -1,17 +1,66 @@
+import functools
+import itertools
+import operator
+import re
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Iterable
+from typing import Any, Iterable, Optional, Tuple
 
 import pandas as pd
 from google.cloud import aiplatform_v1
 
 # pylint: disable=too-many-instance-attributes
 
+_PROJECT_ID_RE = re.compile(r"^projects/([^/]+)/")
+
+
+@functools.lru_cache(maxsize=32)
+def _pipeline_run_re(project_id: str) -> "re.Pattern[str]":
+    """
+    Pattern matching the pipeline run (group 1) and pipeline name (group 2)
+    following the project ID in an artifact URI.
+    """
+    return re.compile(rf"/{re.escape(project_id)}/((?:([^/]*)-)?[^/-]*)")
+
+
+class _LazyMetadata:
+    """
+    Descriptor for the metadata field of a model, which is copied from the
+    raw record on first access unless it was given explicitly.
+    """
+
+    # pylint: disable=protected-access
+
+    def __get__(self, instance: Any, owner: Any = None) -> Optional[dict[str, Any]]:
+        if instance is None:
+            return None  # Default value of the dataclass field.
+        if instance._metadata is None:
+            record = getattr(instance, "_record", None)
+            instance._metadata = (
+                dict(record.metadata or {}) if record is not None else {}
+            )
+        return instance._metadata
+
+    def __set__(self, instance: Any, value: Optional[dict[str, Any]]):
+        instance._metadata = value
+
 
 @dataclass
 class Pipeline:
     """Model class representing a Vertex Pipeline."""
 
+    _COLUMNS = (
+        "name",
+        "display_name",
+        "etag",
+        "create_time",
+        "update_time",
+        "schema_title",
+        "schema_version",
+    )
+    # Slots reduce per-instance memory for large listings.
+    __slots__ = _COLUMNS
+
     name: str
     display_name: str
     etag: str
@@ -23,15 +72,7 @@ class Pipeline:
     @classmethod
     def from_record(cls, record: aiplatform_v1.types.context.Context) -> "Pipeline":
         """Creates an instance from a Google Context record."""
-        return cls(
-            name=record.name,
-            display_name=record.display_name,
-            etag=record.etag,
-            create_time=record.create_time,
-            update_time=record.update_time,
-            schema_title=record.schema_title,
-            schema_version=record.schema_version,
-        )
+        return cls(*cls._row_from_record(record))
 
     @classmethod
     def from_records(
@@ -40,11 +81,44 @@ class Pipeline:
         """Creates an iterable of instances from Google Context records."""
         return (cls.from_record(record) for record in records)
 
+    @staticmethod
+    def _row_from_record(
+        record: aiplatform_v1.types.context.Context,
+    ) -> Tuple[Any, ...]:
+        return (
+            record.name,
+            record.display_name,
+            record.etag,
+            record.create_time,
+            record.update_time,
+            record.schema_title,
+            record.schema_version,
+        )
+
 
 @dataclass
 class PipelineRun:
     """Model class representing a Vertex Pipeline run."""
 
+    _COLUMNS = (
+        "name",
+        "display_name",
+        "etag",
+        "create_time",
+        "update_time",
+        "parent_contexts",
+        "schema_title",
+        "schema_version",
+        "pipeline_name",
+        "metadata",
+    )
+    # Slots reduce per-instance memory for large listings. The metadata value
+    # and raw record are stored in private slots (see _LazyMetadata).
+    __slots__ = tuple(column for column in _COLUMNS if column != "metadata") + (
+        "_metadata",
+        "_record",
+    )
+
     # Fields provided by Google
     name: str
     display_name: str
@@ -54,26 +128,20 @@ class PipelineRun:
     parent_contexts: str
     schema_title: str
     schema_version: str
-    metadata: dict[str, Any]
 
     # Custom fields
     pipeline_name: str
 
+    # Copied from the raw record on first access, unless given explicitly
+    metadata: Optional[dict[str, Any]] = _LazyMetadata()
+
     @classmethod
     def from_record(cls, record: aiplatform_v1.types.context.Context) -> "PipelineRun":
         """Creates an instance from a Google Context record."""
-        return cls(
-            name=record.name,
-            display_name=record.display_name,
-            etag=record.etag,
-            create_time=record.create_time,
-            update_time=record.update_time,
-            parent_contexts=record.parent_contexts,
-            schema_title=record.schema_title,
-            schema_version=record.schema_version,
-            metadata=dict(record.metadata),
-            pipeline_name=str(record.parent_contexts[0]).rsplit("/", 1)[-1],
-        )
+        instance = cls(*cls._row_from_record(record))
+        # pylint: disable=protected-access,attribute-defined-outside-init
+        instance._record = record
+        return instance
 
     @classmethod
     def from_records(
@@ -82,11 +150,49 @@ class PipelineRun:
         """Creates an iterable of instances from Google Context records."""
         return (cls.from_record(record) for record in records)
 
+    @staticmethod
+    def _row_from_record(
+        record: aiplatform_v1.types.context.Context,
+    ) -> Tuple[Any, ...]:
+        return (
+            record.name,
+            record.display_name,
+            record.etag,
+            record.create_time,
+            record.update_time,
+            record.parent_contexts,
+            record.schema_title,
+            record.schema_version,
+            str(record.parent_contexts[0]).rsplit("/", 1)[-1],
+        )
+
 
 @dataclass
 class Artifact:
     """Model class representing a Vertex Artifact."""
 
+    _COLUMNS = (
+        "name",
+        "display_name",
+        "uri",
+        "etag",
+        "create_time",
+        "update_time",
+        "state",
+        "description",
+        "schema_title",
+        "schema_version",
+        "pipeline_name",
+        "pipeline_run",
+        "metadata",
+    )
+    # Slots reduce per-instance memory for large listings. The metadata value
+    # and raw record are stored in private slots (see _LazyMetadata).
+    __slots__ = tuple(column for column in _COLUMNS if column != "metadata") + (
+        "_metadata",
+        "_record",
+    )
+
     # Fields provided by Google
     name: str
     display_name: str
@@ -98,34 +204,21 @@ class Artifact:
     description: str
     schema_title: str
     schema_version: str
-    metadata: dict[str, Any]
 
     # Custom fields
     pipeline_name: str
     pipeline_run: str
 
+    # Copied from the raw record on first access, unless given explicitly
+    metadata: Optional[dict[str, Any]] = _LazyMetadata()
+
     @classmethod
     def from_record(cls, record: aiplatform_v1.types.artifact.Artifact) -> "Artifact":
         """Creates an instance from a Google Artifact record."""
-        project_id = record.name.split("/")[1]
-        pipeline_run = record.uri.split(f"/{project_id}/", 1)[1].split("/", 1)[0]
-        pipeline_name = "-".join(pipeline_run.split("-")[:-1])
-
-        return cls(
-            name=record.name,
-            display_name=record.display_name,
-            uri=record.uri,
-            etag=record.etag,
-            create_time=record.create_time,
-            update_time=record.update_time,
-            state=record.state.name,
-            description=record.description,
-            schema_title=record.schema_title,
-            schema_version=record.schema_version,
-            metadata=dict(record.metadata),
-            pipeline_name=pipeline_name,
-            pipeline_run=pipeline_run,
-        )
+        instance = cls(*cls._row_from_record(record))
+        # pylint: disable=protected-access,attribute-defined-outside-init
+        instance._record = record
+        return instance
 
     @classmethod
     def from_records(
@@ -134,12 +227,84 @@ class Artifact:
         """Creates an iterable of instances from Google Artifact records."""
         return (cls.from_record(record) for record in records)
 
+    @staticmethod
+    def _row_from_record(
+        record: aiplatform_v1.types.artifact.Artifact,
+    ) -> Tuple[Any, ...]:
+        project_id = _PROJECT_ID_RE.match(record.name).group(1)
+        run_match = _pipeline_run_re(project_id).search(record.uri)
+        pipeline_run = run_match.group(1)
+        pipeline_name = run_match.group(2) or ""
+
+        return (
+            record.name,
+            record.display_name,
+            record.uri,
+            record.etag,
+            record.create_time,
+            record.update_time,
+            record.state.name,
+            record.description,
+            record.schema_title,
+            record.schema_version,
+            pipeline_name,
+            pipeline_run,
+        )
+
+
+# Getters returning the field values of a model instance, ordered as in _COLUMNS.
+_ROW_GETTERS = {
+    model: operator.attrgetter(*model._COLUMNS)  # pylint: disable=protected-access
+    for model in (Pipeline, PipelineRun, Artifact)
+}
+
+
+def _model_for_record(record: Any) -> Optional[type]:
+    """Returns the model class matching a raw Google record, if any."""
+    if isinstance(record, aiplatform_v1.Artifact):
+        return Artifact
+    if isinstance(record, aiplatform_v1.Context):
+        # Pipeline runs are the only contexts with a parent (their pipeline).
+        return PipelineRun if record.parent_contexts else Pipeline
+    return None
+
+
+def _row_from_raw_record(model: type, record: Any) -> Tuple[Any, ...]:
+    """Builds a row ordered as in model._COLUMNS from a raw Google record."""
+    # pylint: disable=protected-access
+    row = model._row_from_record(record)
+    if "metadata" in model._COLUMNS:
+        row += (dict(record.metadata or {}),)
+    return row
+
 
 def to_dataframe(records: Iterable[Any], normalize: bool = False) -> pd.DataFrame:
     """
     Converts an iterable of model instances to a DataFrame,
-    optionally normalizing nested fields.
+    optionally normalizing nested fields. Raw Google Artifact and Context
+    records are converted directly, without creating model instances.
     """
-    if normalize:
-        return pd.json_normalize(r.__dict__ for r in records)
-    return pd.DataFrame(r.__dict__ for r in records)
+    records = iter(records)
+    first = next(records, None)
+    if first is None:
+        return pd.DataFrame()
+    records = itertools.chain([first], records)
+
+    model = type(first)
+    row_getter = _ROW_GETTERS.get(model)
+    if row_getter is None:
+        model = _model_for_record(first)
+        if model is None:
+            rows = (r.__dict__ for r in records)
+            return pd.json_normalize(rows) if normalize else pd.DataFrame(rows)
+        row_getter = functools.partial(_row_from_raw_record, model)
+
+    columns = model._COLUMNS  # pylint: disable=protected-access
+    frame = pd.DataFrame.from_records(map(row_getter, records), columns=columns)
+    if normalize and "metadata" in frame:
+        # Only the metadata is nested, so normalize just that column.
+        metadata = pd.json_normalize(frame.pop("metadata").tolist()).add_prefix(
+            "metadata."
+        )
+        frame = frame.join(metadata)
+    return frame
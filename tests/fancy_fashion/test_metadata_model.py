@@ -0,0 +1,194 @@
+from dataclasses import asdict, fields
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from google.cloud import aiplatform_v1
+
+from fancy_fashion.utils.metadata import model
+
+
+def _fake_artifact_record(
+    uri: str = "gs://bucket/runs/123/fancy-fashion-20220101/train/model",
+    metadata: dict = None,
+) -> SimpleNamespace:
+    """Builds a fake Google Artifact record with the attributes used by the models."""
+    return SimpleNamespace(
+        name="projects/123/locations/europe-west1/metadataStores/default/artifacts/1",
+        display_name="model",
+        uri=uri,
+        etag="etag",
+        create_time=None,
+        update_time=None,
+        state=SimpleNamespace(name="LIVE"),
+        description="",
+        schema_title="system.Model",
+        schema_version="0.0.1",
+        metadata={} if metadata is None else metadata,
+    )
+
+
+def _fake_context_record() -> SimpleNamespace:
+    """Builds a fake Google Context record with the attributes used by the models."""
+    return SimpleNamespace(
+        name="projects/123/locations/europe-west1/metadataStores/default/contexts/run-1",
+        display_name="run-1",
+        etag="etag",
+        create_time=None,
+        update_time=None,
+        parent_contexts=[
+            "projects/123/locations/europe-west1/metadataStores/default/contexts/pipeline"
+        ],
+        schema_title="system.PipelineRun",
+        schema_version="0.0.1",
+        metadata={"a": 1},
+    )
+
+
+@pytest.mark.parametrize(
+    "model_cls, record",
+    [
+        (model.Pipeline, _fake_context_record()),
+        (model.PipelineRun, _fake_context_record()),
+        (model.Artifact, _fake_artifact_record()),
+    ],
+)
+def test_models_are_slotted(model_cls, record):
+    """Model instances use slots and can still be constructed by keyword."""
+    instance = model_cls.from_record(record)
+
+    assert not hasattr(instance, "__dict__")
+    assert (
+        model_cls(**{f.name: getattr(instance, f.name) for f in fields(instance)})
+        == instance
+    )
+
+
+def test_pipeline_run_from_record():
+    """Pipeline runs derive their pipeline name from the parent context."""
+    pipeline_run = model.PipelineRun.from_record(_fake_context_record())
+
+    assert pipeline_run.pipeline_name == "pipeline"
+    assert pipeline_run.metadata == {"a": 1}
+
+
+@pytest.mark.parametrize(
+    "uri, pipeline_run, pipeline_name",
+    [
+        ("gs://bucket/123/abc/model", "abc", ""),
+        ("gs://bucket/123/abc-/model", "abc-", "abc"),
+        ("gs://bucket/123/-x/model", "-x", ""),
+        (
+            "gs://bucket/123/fancy-fashion-20220101",
+            "fancy-fashion-20220101",
+            "fancy-fashion",
+        ),
+        (
+            "gs://bucket/runs/nested/123/fancy-fashion-20220101/train/model",
+            "fancy-fashion-20220101",
+            "fancy-fashion",
+        ),
+        ("gs://bucket/123/first-run/123/second-run/model", "first-run", "first"),
+    ],
+)
+def test_artifact_pipeline_run_from_uri(uri, pipeline_run, pipeline_name):
+    """The pipeline run and name are parsed from the path following the project ID."""
+    artifact = model.Artifact.from_record(_fake_artifact_record(uri=uri))
+
+    assert artifact.pipeline_run == pipeline_run
+    assert artifact.pipeline_name == pipeline_name
+
+
+def test_artifact_metadata_is_copied_on_first_access():
+    """Metadata is read from the record on first access, then kept."""
+    record = _fake_artifact_record(metadata={"a": 1})
+    artifact = model.Artifact.from_record(record)
+
+    record.metadata = {"a": 2}
+    assert artifact.metadata == {"a": 2}
+
+    record.metadata = {"a": 3}
+    assert artifact.metadata == {"a": 2}
+
+
+def test_artifact_metadata_field():
+    """Metadata can be passed and set explicitly, and is part of eq/repr/asdict."""
+    artifact = model.Artifact.from_record(_fake_artifact_record(metadata={"a": 1}))
+    copied = model.Artifact(
+        **{f.name: getattr(artifact, f.name) for f in fields(artifact)}
+    )
+
+    assert copied == artifact
+    assert "metadata={'a': 1}" in repr(artifact)
+    assert asdict(artifact)["metadata"] == {"a": 1}
+    assert "_record" not in {f.name for f in fields(artifact)}
+
+    copied.metadata = {"b": 2}
+    assert copied.metadata == {"b": 2}
+    assert copied != artifact
+
+
+def test_to_dataframe_columns():
+    """Columns follow the model fields, with metadata last."""
+    artifacts = model.Artifact.from_records(
+        [_fake_artifact_record(metadata={"a": 1})] * 2
+    )
+
+    df = model.to_dataframe(artifacts)
+
+    assert list(df.columns) == [
+        "name",
+        "display_name",
+        "uri",
+        "etag",
+        "create_time",
+        "update_time",
+        "state",
+        "description",
+        "schema_title",
+        "schema_version",
+        "pipeline_name",
+        "pipeline_run",
+        "metadata",
+    ]
+    assert len(df) == 2
+    assert df["metadata"][0] == {"a": 1}
+
+
+def test_to_dataframe_normalize_matches_json_normalize():
+    """Normalized frames match pd.json_normalize, including dropping empty dicts."""
+    artifacts = [
+        model.Artifact.from_record(_fake_artifact_record(metadata={})),
+        model.Artifact.from_record(
+            _fake_artifact_record(metadata={"a": 1, "empty": {}, "nested": {"b": 2}})
+        ),
+    ]
+
+    df = model.to_dataframe(artifacts, normalize=True)
+    expected = pd.json_normalize([asdict(artifact) for artifact in artifacts])
+
+    pd.testing.assert_frame_equal(df, expected)
+    assert list(df.columns)[-2:] == ["metadata.a", "metadata.nested.b"]
+
+
+def test_to_dataframe_from_raw_records():
+    """Raw Google records are converted like the matching model instances."""
+    artifacts = [
+        aiplatform_v1.Artifact(
+            name="projects/123/locations/europe-west1/metadataStores/default/artifacts/1",
+            uri="gs://bucket/123/fancy-fashion-20220101/model",
+            metadata={"a": 1},
+        )
+    ]
+    pipeline_runs = [aiplatform_v1.Context(name="run", parent_contexts=["pipeline"])]
+    pipelines = [aiplatform_v1.Context(name="pipeline")]
+
+    for model_cls, records in [
+        (model.Artifact, artifacts),
+        (model.PipelineRun, pipeline_runs),
+        (model.Pipeline, pipelines),
+    ]:
+        pd.testing.assert_frame_equal(
+            model.to_dataframe(records),
+            model.to_dataframe(model_cls.from_records(records)),
+        )